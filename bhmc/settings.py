@@ -272,6 +272,8 @@ DATABASES = {
         'HOST': os.getenv("DATABASE_HOST"),
         'PORT': os.getenv("DATABASE_PORT"),
         'TIME_ZONE': 'America/Chicago',
+        'CONN_MAX_AGE': int(os.getenv("DATABASE_CONN_MAX_AGE", "60")),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -287,6 +289,10 @@ CACHES = {
     }
 }
 
+# Tests keep their cache in memory, away from the shared Redis database that is also the Celery broker
+if sys.argv[1:2] == ["test"]:
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+
 # Celery
 CELERY_BROKER_URL = os.getenv("REDIS_URL")
 CELERY_RESULT_BACKEND = "django-db"
@@ -60,6 +60,7 @@ urlpatterns = [
       path("api/import-handicaps/", register_views.import_handicaps),
       path("api/import-points/", damcup_views.import_points),
       path("api/import-scores/", scoring_views.import_scores),
+      path("api/import-scores/<str:task_id>/", scoring_views.import_scores_status),
       path("api/create-customer-session/", payment_views.create_customer_session),
       path("api/issue-refunds/", payment_views.create_refunds),
       path("api/payments/<int:payment_id>/amount/", payment_views.get_payment_amount),
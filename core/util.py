@@ -6,6 +6,7 @@ from django.contrib.admin.options import IncorrectLookupParameters
 from django.contrib.admin.views.main import ChangeList
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db.models.query import QuerySet
 from django.urls import reverse
 from django.utils.encoding import force_str
@@ -33,6 +34,14 @@ def current_season():
     return today.year
 
 
+def bulk_upsert(manager, objs, unique_fields, update_fields, batch_size=None):
+    # MySQL resolves the conflict on any unique key and rejects an explicit target
+    if not connection.features.supports_update_conflicts_with_target:
+        unique_fields = None
+    return manager.bulk_create(objs, batch_size=batch_size, update_conflicts=True,
+                               update_fields=update_fields, unique_fields=unique_fields)
+
+
 class PreFilteredListFilter(SimpleListFilter):
 
     # Either set this or override .get_default_value()
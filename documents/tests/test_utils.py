@@ -0,0 +1,46 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from openpyxl import Workbook
+from unittest import mock
+
+from documents.utils import iter_workbook_rows
+
+
+class IterWorkbookRowsTests(SimpleTestCase):
+
+    @mock.patch("documents.utils.requests.get")
+    def test_xlsx_rows(self, mock_get):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "East Gross Hole Scores"
+        ws.append(["Gross Score"])
+        ws.append(["Stuart Finley", 4, 5, 3])
+        wb.create_sheet("Skins").append(["Ben Hogan", 1])
+        contents = BytesIO()
+        wb.save(contents)
+        mock_get.return_value.content = contents.getvalue()
+        document = mock.Mock()
+        document.file.name = "documents/scores.XLSX"
+
+        sheets = [(name, list(rows)) for name, rows in iter_workbook_rows(document)]
+
+        self.assertEqual(sheets, [
+            ("East Gross Hole Scores", [("Gross Score", None, None, None), ("Stuart Finley", 4, 5, 3)]),
+            ("Skins", [("Ben Hogan", 1)]),
+        ])
+
+    @mock.patch("documents.utils.open_workbook")
+    @mock.patch("documents.utils.requests.get")
+    def test_xls_rows(self, mock_get, mock_open_workbook):
+        sheet = mock.Mock(nrows=2)
+        sheet.name = "North Net Hole Scores"
+        sheet.row_values.side_effect = lambda i: [["Net Score"], ["Ben Hogan 2", 3.0]][i]
+        mock_open_workbook.return_value.sheets.return_value = [sheet]
+        document = mock.Mock()
+        document.file.name = "documents/scores.xls"
+
+        sheets = [(name, list(rows)) for name, rows in iter_workbook_rows(document)]
+
+        self.assertEqual(sheets, [("North Net Hole Scores", [["Net Score"], ["Ben Hogan 2", 3.0]])])
+        mock_open_workbook.assert_called_once_with(file_contents=mock_get.return_value.content)
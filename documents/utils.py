@@ -8,14 +8,30 @@ from openpyxl.reader.excel import load_workbook
 from xlrd import open_workbook
 
 
-def open_xls_workbook(document):
+def open_xlsx_workbook(document):
     file_bytes = requests.get(document.file.url).content
-    return open_workbook(file_contents=file_bytes)
+    return load_workbook(filename=BytesIO(file_bytes), read_only=True)
 
 
-def open_xlsx_workbook(document):
+def iter_workbook_rows(document):
+    """
+    Yield (sheet name, rows) for each sheet in an .xls or .xlsx document,
+    where rows is an iterator of row value tuples. The file is downloaded
+    into memory; openpyxl then reads .xlsx rows lazily in read-only mode
+    instead of building every cell up front as xlrd does.
+    """
     file_bytes = requests.get(document.file.url).content
-    return load_workbook(filename=BytesIO(file_bytes), read_only=True)
+    if document.file.name.lower().endswith(".xlsx"):
+        wb = load_workbook(filename=BytesIO(file_bytes), read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                yield ws.title, ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+    else:
+        wb = open_workbook(file_contents=file_bytes)
+        for sheet in wb.sheets():
+            yield sheet.name, (sheet.row_values(i) for i in range(sheet.nrows))
 
 
 def file_cleanup(sender, **kwargs):
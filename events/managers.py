@@ -1,5 +1,14 @@
+import structlog
+
+from django.core.cache import cache
 from django.db import models
 
+logger = structlog.getLogger(__name__)
+
+# Cache key and lifetime for the fee columns the event report adds to each registration
+REPORT_COLUMNS_KEY = "event_fee_report_columns:{}"
+REPORT_COLUMNS_TIMEOUT = 60 * 60
+
 
 class EventManager(models.Manager):
 
@@ -50,3 +59,21 @@ class EventFeeManager(models.Manager):
 
     def get_queryset(self):
         return super().get_queryset().select_related("fee_type")
+
+    def report_columns(self, event_id):
+        """(id, fee type name, override amount, override restriction) for each fee of the event."""
+        key = REPORT_COLUMNS_KEY.format(event_id)
+        columns = cache.get(key)
+        if columns is None:
+            columns = list(self.filter(event=event_id).values_list(
+                "id", "fee_type__name", "override_amount", "override_restriction"
+            ))
+            cache.set(key, columns, REPORT_COLUMNS_TIMEOUT)
+        return columns
+
+    def clear_report_columns(self, event_ids):
+        # the cache is only a shortcut, so an unreachable Redis must not fail the fee change
+        try:
+            cache.delete_many([REPORT_COLUMNS_KEY.format(event_id) for event_id in event_ids])
+        except Exception as e:
+            logger.warning("Event fee report columns not cleared", event_ids=event_ids, error=str(e))
@@ -2,8 +2,9 @@ import pytz
 from datetime import datetime
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import CASCADE, DO_NOTHING, UniqueConstraint
+from django.db.models.signals import post_delete, post_save
 from simple_history.models import HistoricalRecords
 from django.utils import timezone
 
@@ -196,3 +197,35 @@ class EventFee(models.Model):
 
     def __str__(self):
         return "{} (${})".format(self.fee_type, self.amount)
+
+
+def clear_event_fee_report_columns(sender, instance, **kwargs):
+    # fixture loads pass raw; clear after commit so a concurrent report cannot re-cache the old columns
+    if kwargs.get("raw"):
+        return
+    event_ids = [instance.event_id]
+    transaction.on_commit(lambda: EventFee.objects.clear_report_columns(event_ids))
+
+
+post_save.connect(
+    clear_event_fee_report_columns, sender=EventFee, dispatch_uid="eventfee.clear_report_columns"
+)
+post_delete.connect(
+    clear_event_fee_report_columns, sender=EventFee, dispatch_uid="eventfee.clear_report_columns"
+)
+
+
+def clear_fee_type_report_columns(sender, instance, **kwargs):
+    # the report columns carry the fee type name
+    if kwargs.get("raw"):
+        return
+    event_ids = set(EventFee.objects.filter(fee_type=instance.pk).values_list("event_id", flat=True))
+    transaction.on_commit(lambda: EventFee.objects.clear_report_columns(event_ids))
+
+
+post_save.connect(
+    clear_fee_type_report_columns, sender=FeeType, dispatch_uid="feetype.clear_report_columns"
+)
+post_delete.connect(
+    clear_fee_type_report_columns, sender=FeeType, dispatch_uid="feetype.clear_report_columns"
+)
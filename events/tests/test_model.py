@@ -1,10 +1,12 @@
 from datetime import date
 from datetime import timedelta
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.test import TestCase
+from unittest import mock
 
-from events.models import Event
+from events.models import Event, EventFee, FeeType
 
 
 class EventModelTests(TestCase):
@@ -73,3 +75,42 @@ class EventModelTests(TestCase):
         new_dt = date.fromisoformat('2020-12-31')
         copy = Event.objects.clone(event, new_dt)
         self.assertGreater(len(copy.fees.all()), 0)
+
+    def test_report_columns_cleared_when_fee_changes(self):
+        cache.clear()
+        columns = EventFee.objects.report_columns(3)
+        self.assertEqual(columns[0][0], 6)
+        self.assertIsNone(columns[0][3])
+
+        with self.assertNumQueries(0):
+            EventFee.objects.report_columns(3)
+
+        fee = EventFee.objects.get(pk=6)
+        fee.override_restriction = "Members"
+        with self.captureOnCommitCallbacks(execute=True):
+            fee.save()
+
+        self.assertEqual(EventFee.objects.report_columns(3)[0][3], "Members")
+        cache.clear()
+
+    def test_report_columns_cleared_when_fee_type_renamed(self):
+        cache.clear()
+        self.assertEqual(EventFee.objects.report_columns(3)[0][1], "Event Fee")
+
+        fee_type = FeeType.objects.get(pk=5)
+        fee_type.name = "Weeknight Fee"
+        with self.captureOnCommitCallbacks(execute=True):
+            fee_type.save()
+
+        self.assertEqual(EventFee.objects.report_columns(3)[0][1], "Weeknight Fee")
+        cache.clear()
+
+    @mock.patch("events.managers.cache.delete_many", side_effect=ConnectionError("redis is down"))
+    def test_fee_save_survives_cache_errors(self, mock_delete):
+        fee = EventFee.objects.get(pk=6)
+        fee.override_restriction = "Members"
+        with self.captureOnCommitCallbacks(execute=True):
+            fee.save()
+
+        mock_delete.assert_called_once()
+        self.assertEqual(EventFee.objects.get(pk=6).override_restriction, "Members")
@@ -36,10 +36,7 @@ def handle_payment_complete(self, payment_intent):
     payment.confirm_date = timezone.now()
     payment.save()
 
-    payment_details = list(payment.payment_details.all())
-    for detail in payment_details:
-        detail.is_paid = True
-        detail.save()
+    payment.payment_details.update(is_paid=True)
 
     # Transitions the slot status from processing to reserved
     slots = Registration.objects.payment_confirmed(registration_id)
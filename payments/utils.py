@@ -57,7 +57,7 @@ def round_half_up(n, decimals=0):
 
 def has_required_fees(event, payment_details):
     event_fees = event.fees.all()
-    event_fee_ids = [detail["event_fee"].id for detail in payment_details]
+    event_fee_ids = {detail["event_fee"].id for detail in payment_details}
     required = next(iter([f for f in event_fees if f.is_required and f.id in event_fee_ids]), None)
     return required is not None
 
@@ -200,14 +200,11 @@ def create_admin_payment(event, slot, fee_ids, is_money_owed, user):
                                      confirmed=True,
                                      confirm_date=date.today(),
                                      notification_type="A")
-    payment.save()
-
-    for _, fee in enumerate(event_fees):
-        registration_fee = RegistrationFee(event_fee=fee,
-                                           registration_slot=slot,
-                                           is_paid=False,
-                                           payment=payment)
-        registration_fee.save()
+
+    RegistrationFee.objects.bulk_create([
+        RegistrationFee(event_fee=fee, registration_slot=slot, is_paid=False, payment=payment)
+        for fee in event_fees
+    ])
 
     return payment
 
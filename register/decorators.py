@@ -1,7 +1,12 @@
 import functools
 
 from django.contrib.admin import helpers
+from django.middleware.http import ConditionalGetMiddleware
 from django.template.response import TemplateResponse
+from django.utils.decorators import decorator_from_middleware
+
+# Sets an ETag on GET responses and answers a matching If-None-Match with a 304
+conditional_get = decorator_from_middleware(ConditionalGetMiddleware)
 
 
 def action_form(form_class=None):
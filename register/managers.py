@@ -10,9 +10,10 @@ import structlog
 from datetime import timedelta
 
 from django.utils import timezone as tz
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
-from django.db.models import Max, Q
+from django.db.models import Q
 
 from courses.models import Hole
 from payments.models import Payment
@@ -20,6 +21,28 @@ from register.exceptions import SlotConflictError, MissingSlotsError, AlreadyReg
 
 logger = structlog.getLogger(__name__)
 
+# Cache key and lifetime for the member name to player id map used by the score import
+MEMBER_IDS_KEY = "member_ids_by_name"
+MEMBER_IDS_TIMEOUT = 60 * 5
+
+
+class PlayerManager(models.Manager):
+
+    def member_ids_by_name(self):
+        """Full name to player id for each member."""
+        member_ids = cache.get(MEMBER_IDS_KEY)
+        if member_ids is None:
+            member_ids = dict(self.filter(is_member=True).values_list("full_name", "id"))
+            cache.set(MEMBER_IDS_KEY, member_ids, MEMBER_IDS_TIMEOUT)
+        return member_ids
+
+    def clear_member_ids_by_name(self):
+        # the cache is only a shortcut, so an unreachable Redis must not fail the player change
+        try:
+            cache.delete(MEMBER_IDS_KEY)
+        except Exception as e:
+            logger.warning("Member ids not cleared", error=str(e))
+
 
 class RegistrationManager(models.Manager):
 
@@ -47,7 +70,7 @@ class RegistrationManager(models.Manager):
                 .exclude(event__can_choose=True) \
                 .delete()
 
-            if len(reg.slots.all()) == 0:
+            if not reg.slots.exists():
                 reg.delete()
 
         return count
@@ -74,19 +97,15 @@ class RegistrationManager(models.Manager):
             reg = self.create_or_update_registration(event, user, course, signed_up_by)
 
             logger.info("Reserving slots", eventId=event.id, course=course.name, user=signed_up_by, slots=slot_ids)
-            for i, slot in enumerate(slots):
-                if i == 0:
-                    slot.player = player
-                slot.status = "P"
-                slot.registration = reg
-                slot.save()
+            event.registrations.filter(pk__in=slot_ids).update(status="P", registration=reg)
+            event.registrations.filter(pk=slots[0].pk).update(player=player)
         else:
             reg = self.create_or_update_registration(event, user, course, signed_up_by)
-            for s in range(0, event.maximum_signup_group_size):
-                slot = event.registrations.create(event=event, registration=reg, status="P", starting_order=0, slot=s)
-                if slot.slot == 0:
-                    slot.player = player
-                slot.save()
+            event.registrations.bulk_create([
+                event.registrations.model(event=event, registration=reg, player=player if s == 0 else None,
+                                          status="P", starting_order=0, slot=s)
+                for s in range(0, event.maximum_signup_group_size)
+            ])
 
         return reg
 
@@ -178,11 +197,7 @@ class RegistrationSlotManager(models.Manager):
         return super().get_queryset().select_related("player")
 
     def is_registered(self, event_id, player_id):
-        try:
-            self.filter(event__id=event_id).filter(player__id=player_id).filter(status="R").get()
-            return True
-        except ObjectDoesNotExist:
-            return False
+        return self.filter(event_id=event_id, player_id=player_id, status="R").exists()
 
     def players(self, event_id):
         return self.filter(event__id=event_id).values_list("player", flat=True)
@@ -208,7 +223,6 @@ class RegistrationSlotManager(models.Manager):
 
     def remove_slots_for_event(self, event):
         self.filter(event=event).delete()
-        pass
 
     def create_slots_for_event(self, event):
         slots = []
@@ -219,37 +233,36 @@ class RegistrationSlotManager(models.Manager):
                 holes = Hole.objects.filter(course=course)
                 for hole in holes:
                     for s in range(0, event.group_size):
-                        a_slot = self.create(event=event, hole=hole, starting_order=0, slot=s)
-                        slots.append(a_slot)
+                        slots.append(self.model(event=event, hole=hole, starting_order=0, slot=s))
                     # Only add 2nd group on par 4s and 5s
                     # if hole.par != 3:
                     # for s in range(0, event.group_size):
-                        b_slot = self.create(event=event, hole=hole, starting_order=1, slot=s)
-                        slots.append(b_slot)
+                        slots.append(self.model(event=event, hole=hole, starting_order=1, slot=s))
         elif event.can_choose and event.start_type == "TT":
             for course in event.courses.all():
                 hole = Hole.objects.filter(course=course).filter(hole_number=1).get()
                 for i in range(event.total_groups):
                     status = "U" if event.starter_time_interval > 0\
                                  and (i + 1) % event.starter_time_interval == 0\
-                                 else "A "
+                                 else "A"
                     for s in range(0, event.group_size):
-                        slot = self.create(event=event, hole=hole, starting_order=i, slot=s, status=status)
-                        slots.append(slot)
+                        slots.append(self.model(event=event, hole=hole, starting_order=i, slot=s, status=status))
 
-        return slots
+        self.bulk_create(slots, batch_size=500)
+
+        # MySQL does not return the new keys from a bulk insert, so read the slots back in insert order
+        return list(self.filter(event=event).order_by("id"))
 
     def remove_hole(self, event, hole, starting_order):
         self.filter(event=event, hole=hole, starting_order=starting_order).delete()
 
+    @transaction.atomic()
     def add_slots_for_hole(self, event, hole):
         slots = []
-        start = 0
 
-        # get max starting order and increment 1
-        previous = self.filter(event=event, hole=hole).aggregate(Max("starting_order"))
-        if len(previous):
-            start = previous["starting_order__max"] + 1
+        # lock the existing groups on this hole and start one past the highest starting order
+        previous = self.select_for_update().filter(event=event, hole=hole).values_list("starting_order", flat=True)
+        start = max(previous, default=-1) + 1
 
         for s in range(0, event.maximum_signup_group_size):
             slot = self.create(event=event, hole=hole, starting_order=start, slot=s)
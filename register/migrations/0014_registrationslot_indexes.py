@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('events', '0012_eventfeeoverride_eventfee_override_amount_and_more'),
+        ('register', '0013_remove_historicalregistration_course_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='registrationslot',
+            index=models.Index(fields=['event', 'status'], name='slot_event_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registrationslot',
+            index=models.Index(fields=['event', 'hole', 'starting_order', 'status'], name='slot_event_hole_order_idx'),
+        ),
+    ]
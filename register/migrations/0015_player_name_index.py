@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0006_alter_staticdocument_options'),
+        ('register', '0014_registrationslot_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['last_name', 'first_name'], name='player_name_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:29
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('register', '0015_player_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='full_name',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Concat('first_name', models.Value(' '), 'last_name'), output_field=models.CharField(max_length=61), verbose_name='Full name'),
+        ),
+    ]
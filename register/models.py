@@ -1,15 +1,17 @@
 from datetime import datetime
 
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models import DO_NOTHING, SET_NULL, CASCADE, UniqueConstraint
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.db.models import DO_NOTHING, SET_NULL, CASCADE, Index, UniqueConstraint, Value
+from django.db.models.functions import Concat
 from simple_history.models import HistoricalRecords
 
 from documents.models import Photo
 from events.models import Event, EventFee
 from courses.models import Course, Hole
 from payments.models import Payment
-from .managers import RegistrationSlotManager, RegistrationManager
+from .managers import PlayerManager, RegistrationSlotManager, RegistrationManager
 
 STATUS_CHOICES = (
     ("A", "Available"),
@@ -37,12 +39,20 @@ class Player(models.Model):
     favorites = models.ManyToManyField("self", blank=True)
     is_member = models.BooleanField(verbose_name="Is Member", default=False)
     last_season = models.IntegerField(verbose_name="Most Recent Membership Season", null=True, blank=True)
+    full_name = models.GeneratedField(verbose_name="Full name",
+                                      expression=Concat("first_name", Value(" "), "last_name"),
+                                      output_field=models.CharField(max_length=61),
+                                      db_persist=True)
 
-    history = HistoricalRecords()
+    objects = PlayerManager()
+    history = HistoricalRecords(excluded_fields=["full_name"])
 
     class Meta:
         ordering = ('last_name', 'first_name')
         base_manager_name = 'objects'
+        indexes = [
+            Index(fields=["last_name", "first_name"], name="player_name_idx"),
+        ]
 
     def player_name(self):
         return "{} {}".format(self.first_name, self.last_name)
@@ -61,6 +71,17 @@ class Player(models.Model):
         return ["user__last_name__icontains", "user__first_name__icontains", ]
 
 
+def clear_member_ids_by_name(sender, instance, **kwargs):
+    # fixture loads pass raw; clear after commit so a concurrent import cannot re-cache the old names
+    if kwargs.get("raw"):
+        return
+    transaction.on_commit(Player.objects.clear_member_ids_by_name)
+
+
+post_save.connect(clear_member_ids_by_name, sender=Player, dispatch_uid="player.clear_member_ids_by_name")
+post_delete.connect(clear_member_ids_by_name, sender=Player, dispatch_uid="player.clear_member_ids_by_name")
+
+
 class Registration(models.Model):
     event = models.ForeignKey(verbose_name="Event", to=Event, on_delete=CASCADE)
     course = models.ForeignKey(verbose_name="Course", to=Course, null=True, blank=True, on_delete=DO_NOTHING)
@@ -97,6 +118,10 @@ class RegistrationSlot(models.Model):
         constraints = [
             UniqueConstraint(fields=["event", "player"], name="unique_player_registration")
         ]
+        indexes = [
+            Index(fields=["event", "status"], name="slot_event_status_idx"),
+            Index(fields=["event", "hole", "starting_order", "status"], name="slot_event_hole_order_idx"),
+        ]
 
     objects = RegistrationSlotManager()
 
@@ -258,10 +258,13 @@ class PlayerHandicapSerializer(serializers.ModelSerializer):
 
 def validate_event_is_not_full(event):
     if event.registration_maximum is not None and event.registration_maximum != 0:
-        registrations = (
-            RegistrationSlot.objects.filter(event=event).filter(status="R").count()
+        # Stop scanning as soon as the maximum is reached rather than counting every reserved slot
+        is_full = (
+            RegistrationSlot.objects.filter(event=event)
+            .filter(status="R")[event.registration_maximum - 1:]
+            .exists()
         )
-        if registrations >= event.registration_maximum:
+        if is_full:
             raise EventFullError()
 
 
@@ -0,0 +1,65 @@
+import csv
+
+import structlog
+
+from celery import shared_task
+from decimal import Decimal
+
+from core.util import bulk_upsert
+from documents.models import Document
+from register.models import Player, PlayerHandicap
+
+logger = structlog.getLogger(__name__)
+
+# Handicaps written per INSERT while a GHIN export is being read
+IMPORT_BATCH_SIZE = 1000
+
+
+@shared_task
+def import_handicaps_task(season, document_id):
+    document = Document.objects.get(pk=document_id)
+    player_map = dict(
+        Player.objects.exclude(ghin__isnull=True).exclude(ghin="").values_list("ghin", "id").iterator(chunk_size=2000)
+    )
+    handicaps = []
+    count = 0
+
+    with document.file.open("r") as csvfile:
+        reader = csv.reader(csvfile, delimiter=',', quotechar='"')
+        next(reader)  # skip header
+
+        for row in reader:
+            player_id = player_map.get(row[2])
+
+            if player_id is None:
+                continue
+
+            handicaps.append(PlayerHandicap(season=season, player_id=player_id, handicap=get_index(row[1])))
+
+            if len(handicaps) == IMPORT_BATCH_SIZE:
+                save_handicaps(handicaps)
+                count += len(handicaps)
+                handicaps = []
+
+    save_handicaps(handicaps)
+    count += len(handicaps)
+
+    logger.info("Handicaps imported", season=season, document_id=document_id, count=count)
+
+    return {
+        "message": "Handicaps imported",
+        "season": season,
+        "count": count
+    }
+
+
+def save_handicaps(handicaps):
+    bulk_upsert(PlayerHandicap.objects, handicaps, unique_fields=["player", "season"], update_fields=["handicap"])
+
+
+def get_index(cell):
+    # a "+" index is better than scratch and is stored as a negative number
+    if cell.startswith("+"):
+        return Decimal("-" + cell[1:])
+    else:
+        return Decimal(cell)
@@ -11,7 +11,8 @@ from rest_framework.test import APIClient
 from unittest import mock, skip
 
 from events.models import Event
-from register.models import RegistrationSlot, Registration
+from payments.models import Payment
+from register.models import RegistrationSlot, Registration, RegistrationFee
 
 
 def update_event_to_registering(event_id):
@@ -338,3 +339,187 @@ class RegistrationTests(TestCase):
 
         slot = RegistrationSlot.objects.get(pk=1)
         self.assertEqual(slot.status, "A")
+
+    def test_registration_list_query_count(self):
+        registration = Registration.objects.create(event_id=3, user=self.user, signed_up_by="Stuart Finley")
+        RegistrationSlot.objects.filter(pk=1).update(registration=registration, player=1, status="R")
+        RegistrationSlot.objects.filter(pk=2).update(registration=registration, player=2, status="R")
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        # one query for the registrations, one for the slots and their players
+        with self.assertNumQueries(2):
+            response = client.get("/api/registration/?event_id=3")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.data[0]["slots"][0]["player"]["id"], 1)
+
+    def test_registration_list_requires_filter(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get("/api/registration/")
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_slot_list_requires_filter(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get("/api/registration-slots/?is_open=true")
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+
+class MoveAndDropTests(TestCase):
+    fixtures = ["fee_type", "event", "event_fee", "registration_slot", "course", "hole", "user", "player"]
+
+    def setUp(self):
+        self.user = User.objects.get(email="finleysg@gmail.com")
+        self.registration = Registration.objects.create(event_id=3, user=self.user, signed_up_by="Stuart Finley")
+        RegistrationSlot.objects.filter(pk=1).update(registration=self.registration, player=1, status="R")
+        RegistrationSlot.objects.filter(pk=2).update(registration=self.registration, player=2, status="R")
+        payment = Payment.objects.create(event_id=3, user=self.user, payment_code="test", confirmed=True)
+        RegistrationFee.objects.create(event_fee_id=6, registration_slot_id=1, payment=payment, amount=5)
+        RegistrationFee.objects.create(event_fee_id=6, registration_slot_id=2, payment=payment, amount=5)
+
+    def test_move_players(self):
+        data = json.dumps({
+            "source_slots": [1, 2],
+            "destination_slots": [11, 12],
+        })
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.put("/api/registration/{}/move/".format(self.registration.id),
+                              data=data, content_type="application/json")
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+        sources = RegistrationSlot.objects.filter(pk__in=[1, 2])
+        self.assertTrue(all(s.status == "A" and s.player is None and s.registration is None for s in sources))
+
+        destination = RegistrationSlot.objects.get(pk=11)
+        self.assertEqual(destination.status, "R")
+        self.assertEqual(destination.player_id, 1)
+        self.assertEqual(destination.registration_id, self.registration.id)
+        self.assertEqual(RegistrationSlot.objects.get(pk=12).player_id, 2)
+
+        fees = RegistrationFee.objects.order_by("id").values_list("registration_slot_id", flat=True)
+        self.assertEqual(list(fees), [11, 12])
+
+        self.registration.refresh_from_db()
+        self.assertIn("Stuart Finley moved from East 3:00 PM to East 3:20 PM by Stuart Finley",
+                      self.registration.notes)
+        self.assertIn("Ben Hogan moved from East 3:00 PM to East 3:20 PM by Stuart Finley",
+                      self.registration.notes)
+
+    def test_move_players_accepts_string_ids(self):
+        data = json.dumps({
+            "source_slots": ["1"],
+            "destination_slots": ["11"],
+        })
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.put("/api/registration/{}/move/".format(self.registration.id),
+                              data=data, content_type="application/json")
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertEqual(RegistrationSlot.objects.get(pk=11).player_id, 1)
+
+    def test_move_players_slot_not_in_registration(self):
+        data = json.dumps({
+            "source_slots": [3],
+            "destination_slots": [11],
+        })
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.put("/api/registration/{}/move/".format(self.registration.id),
+                              data=data, content_type="application/json")
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertIsNone(RegistrationSlot.objects.get(pk=11).player_id)
+
+    def test_drop_players(self):
+        data = json.dumps({
+            "source_slots": [2],
+        })
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.delete("/api/registration/{}/drop/".format(self.registration.id),
+                                 data=data, content_type="application/json")
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+        dropped = RegistrationSlot.objects.get(pk=2)
+        self.assertEqual(dropped.status, "A")
+        self.assertIsNone(dropped.player)
+        self.assertIsNone(dropped.registration)
+        self.assertEqual(RegistrationSlot.objects.get(pk=1).player_id, 1)
+
+        fees = RegistrationFee.objects.order_by("id").values_list("registration_slot_id", flat=True)
+        self.assertEqual(list(fees), [1, None])
+
+        self.registration.refresh_from_db()
+        self.assertIn("Ben Hogan dropped from the event by Stuart Finley", self.registration.notes)
+
+    def test_drop_players_keeps_existing_notes(self):
+        Registration.objects.filter(pk=self.registration.id).update(notes="Paid in cash")
+        data = json.dumps({
+            "source_slots": [2],
+        })
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        client.delete("/api/registration/{}/drop/".format(self.registration.id),
+                      data=data, content_type="application/json")
+
+        self.registration.refresh_from_db()
+        self.assertEqual(self.registration.notes,
+                         "Paid in cash\n\nBen Hogan dropped from the event by Stuart Finley")
+
+    def test_drop_players_accepts_string_ids(self):
+        data = json.dumps({
+            "source_slots": ["2"],
+        })
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.delete("/api/registration/{}/drop/".format(self.registration.id),
+                                 data=data, content_type="application/json")
+
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertIsNone(RegistrationSlot.objects.get(pk=2).player_id)
+
+    def test_drop_players_slot_not_in_registration(self):
+        RegistrationSlot.objects.filter(pk=3).update(player=3, status="R")
+        data = json.dumps({
+            "source_slots": [2, 3],
+        })
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.delete("/api/registration/{}/drop/".format(self.registration.id),
+                                 data=data, content_type="application/json")
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(RegistrationSlot.objects.get(pk=2).player_id, 2)
+        self.assertEqual(RegistrationSlot.objects.get(pk=3).player_id, 3)
+
+    def test_drop_players_unknown_registration(self):
+        data = json.dumps({
+            "source_slots": [2],
+        })
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.delete("/api/registration/999/drop/", data=data, content_type="application/json")
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class EventSlotTests(TestCase):
+    fixtures = ["fee_type", "event", "event_fee", "registration_slot", "course", "hole", "user", "player"]
+
+    def test_create_event_slots(self):
+        user = User.objects.get(email="finleysg@gmail.com")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post("/api/events/3/create-slots/")
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        # 3 courses, 18 groups of 5
+        self.assertEqual(len(response.data), 270)
+        self.assertEqual(RegistrationSlot.objects.filter(event=3).count(), 270)
+        self.assertTrue(all(slot["id"] is not None for slot in response.data))
+        self.assertEqual(response.data[0]["status"], "A")
+        self.assertEqual([slot["slot"] for slot in response.data[:5]], [0, 1, 2, 3, 4])
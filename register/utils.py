@@ -2,8 +2,7 @@ import re
 from datetime import timedelta, datetime
 
 
-def get_start(slot):
-    event = slot.event
+def get_start(event, slot):
     if event.start_type == "TT":
         return get_starting_time(event, slot)
     else:
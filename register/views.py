@@ -1,20 +1,23 @@
-import csv
-
-from decimal import Decimal
+from urllib.parse import quote
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Q, TextField, Value, When
+from django.db.models.functions import Concat
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 from rest_framework import viewsets
 from rest_framework import permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 
-from documents.models import Document
 from events.models import Event
 from payments.utils import create_admin_payment
 from reporting.views import fetch_all_as_dictionary
+from .decorators import conditional_get
 from .models import Registration, RegistrationSlot, Player, RegistrationFee, PlayerHandicap
 from .serializers import (
     RegistrationSlotSerializer,
@@ -23,10 +26,22 @@ from .serializers import (
     SimplePlayerSerializer,
     UpdatableRegistrationSlotSerializer, RegistrationFeeSerializer, PlayerHandicapSerializer,
 )
+from .tasks import import_handicaps_task
 from .utils import get_start
 
+# Query parameters that filter players on the field of the same name
+PLAYER_FILTERS = ("email", "ghin")
+
+# Slot columns read or written when players are moved or dropped
+MOVE_SLOT_FIELDS = ("event", "registration", "starting_order", "status", "hole__hole_number", "hole__course__name",
+                    "player__full_name")
+
+# Seconds a player search result is reused for the same pattern
+PLAYER_SEARCH_TIMEOUT = 30
+
 
 @permission_classes((permissions.IsAuthenticated,))
+@method_decorator(conditional_get, name="list")
 class PlayerViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         email = self.request.query_params.get("email", None)
@@ -35,18 +50,15 @@ class PlayerViewSet(viewsets.ModelViewSet):
         return PlayerSerializer
 
     def get_queryset(self):
-        queryset = Player.objects.all()
-        email = self.request.query_params.get("email", None)
-        ghin = self.request.query_params.get("ghin", None)
-        members_only = self.request.query_params.get("members-only", None)
+        params = self.request.query_params
+        filters = {field: params[field] for field in PLAYER_FILTERS if field in params}
 
-        if email is not None:
-            queryset = queryset.filter(email=email)
-        if ghin is not None:
-            queryset = queryset.filter(ghin=ghin)
-        if members_only and members_only == "true":
-            queryset = queryset.filter(is_member=True)
+        if params.get("members-only") == "true":
+            filters["is_member"] = True
 
+        queryset = Player.objects.filter(**filters)
+        if self.get_serializer_class() is SimplePlayerSerializer:
+            queryset = queryset.only(*SimplePlayerSerializer.Meta.fields)
         return queryset
 
     def get_serializer_context(self):
@@ -59,22 +71,26 @@ class RegistrationViewSet(viewsets.ModelViewSet):
     serializer_class = RegistrationSerializer
 
     def get_queryset(self):
-        queryset = Registration.objects.all()
         event_id = self.request.query_params.get("event_id", None)
         player_id = self.request.query_params.get("player_id", None)
         seasons = self.request.query_params.getlist("seasons", None)
         is_self = self.request.query_params.get("player", None)
 
+        criteria = Q()
         if event_id is not None:
-            queryset = queryset.filter(event=event_id).prefetch_related("slots")
+            criteria &= Q(event=event_id)
         if player_id is not None:
-            queryset = queryset.filter(slots__player_id=player_id).prefetch_related("slots")
+            criteria &= Q(slots__player_id=player_id)
         if seasons:
-            queryset = queryset.filter(event__season__in=seasons)
+            criteria &= Q(event__season__in=seasons)
         if is_self == "me":
-            queryset = queryset.filter(user=self.request.user.id).prefetch_related("slots")
+            criteria &= Q(user=self.request.user.id)
 
-        return queryset
+        # never serialize every registration ever made
+        if self.action == "list" and not criteria:
+            raise ValidationError("A filter is required")
+
+        return Registration.objects.filter(criteria).prefetch_related("slots")
 
 
 class RegistrationSlotViewsSet(viewsets.ModelViewSet):
@@ -91,6 +107,9 @@ class RegistrationSlotViewsSet(viewsets.ModelViewSet):
         is_open = self.request.query_params.get("is_open", False)
         seasons = self.request.query_params.getlist("seasons", None)
 
+        if self.action == "list" and event_id is None and player_id is None and not seasons:
+            raise ValidationError("A filter is required")
+
         if event_id is not None:
             queryset = queryset.filter(event=event_id)
         if player_id is not None:
@@ -150,6 +169,7 @@ def cancel_reserved_slots(request, registration_id):
 
 
 @api_view(['POST', ])
+@transaction.atomic()
 @permission_classes((permissions.IsAdminUser,))
 def create_event_slots(request, event_id):
     event = Event.objects.get(pk=event_id)
@@ -171,25 +191,31 @@ def cancel_expired(request):
 
 @api_view(("GET",))
 @permission_classes((permissions.IsAuthenticated,))
+@conditional_get
 def player_search(request):
     player_id = request.query_params.get("player_id", 0)
     pattern = request.query_params.get("pattern", "")
 
-    with connection.cursor() as cursor:
-        cursor.callproc(
-            "SearchPlayers",
-            [
-                pattern,
-                player_id,
-            ],
-        )
-        players = fetch_all_as_dictionary(cursor)
+    key = "player_search:{}:{}".format(player_id, quote(pattern))
+    players = cache.get(key)
+    if players is None:
+        with connection.cursor() as cursor:
+            cursor.callproc(
+                "SearchPlayers",
+                [
+                    pattern,
+                    player_id,
+                ],
+            )
+            players = fetch_all_as_dictionary(cursor)
+        cache.set(key, players, PLAYER_SEARCH_TIMEOUT)
 
     return Response(players, status=200)
 
 
 @api_view(["GET", ])
 @permission_classes((permissions.IsAuthenticated,))
+@conditional_get
 def friends(request, player_id):
     with connection.cursor() as cursor:
         cursor.callproc(
@@ -206,12 +232,10 @@ def friends(request, player_id):
 @api_view(["POST", ])
 @permission_classes((permissions.IsAuthenticated,))
 def add_friend(request, player_id):
-    player = Player.objects.get(email=request.user.email)
-    friend = get_object_or_404(Player, pk=player_id)
+    player, friend = get_player_and_friend(request.user, player_id)
     player.favorites.add(friend)
-    player.save()
     serializer = PlayerSerializer(
-        player.favorites, context={"request": request}, many=True
+        get_favorites(player), context={"request": request}, many=True
     )
     return Response(serializer.data)
 
@@ -219,12 +243,10 @@ def add_friend(request, player_id):
 @api_view(["DELETE", ])
 @permission_classes((permissions.IsAuthenticated,))
 def remove_friend(request, player_id):
-    player = Player.objects.get(email=request.user.email)
-    friend = get_object_or_404(Player, pk=player_id)
+    player, friend = get_player_and_friend(request.user, player_id)
     player.favorites.remove(friend)
-    player.save()
     serializer = PlayerSerializer(
-        player.favorites, context={"request": request}, many=True
+        get_favorites(player), context={"request": request}, many=True
     )
     return Response(serializer.data)
 
@@ -243,7 +265,7 @@ def add_player(request, event_id):
         raise ValidationError("A player is required.")
 
     event = Event.objects.get(pk=event_id)
-    player = Player.objects.get(pk=player_id)
+    player = Player.objects.only("id", "email").get(pk=player_id)
     user = User.objects.get(email=player.email)
 
     if event.can_choose:
@@ -254,7 +276,7 @@ def add_player(request, event_id):
         slot.status = "R"
         slot.player = player
         slot.registration = registration
-        slot.save()
+        slot.save(update_fields=["status", "player", "registration"])
     else:
         registration = Registration.objects.create(event=event, user=user, signed_up_by=request.user.get_full_name(),
                                                    notes=notes)
@@ -274,37 +296,45 @@ def move_players(request, registration_id):
     source_slots = request.data.get("source_slots", [])
     destination_slots = request.data.get("destination_slots", [])
 
-    registration = Registration.objects.filter(pk=registration_id).get()
+    registration = get_object_or_404(Registration.objects.select_related("event"), pk=registration_id)
+    event = registration.event
+    source_slots, sources = get_slots_in_bulk(
+        registration.slots.select_related("hole__course").only(*MOVE_SLOT_FIELDS), source_slots
+    )
+    destination_slots, destinations = get_slots_in_bulk(
+        RegistrationSlot.objects.select_related("hole__course").only(*MOVE_SLOT_FIELDS), destination_slots
+    )
+    user_name = request.user.get_full_name()
+    messages = []
+    fee_moves = []
 
     for index, slot_id in enumerate(source_slots):
-        source = registration.slots.get(pk=slot_id)
-        destination = RegistrationSlot.objects.get(pk=destination_slots[index])
-
-        user_name = request.user.get_full_name()
-        player_name = "{} {}".format(source.player.first_name, source.player.last_name)
-        source_start = get_start(source)
-        destination_start = get_start(destination)
-        message = "\n{} moved from {} to {} by {}".format(player_name, source_start, destination_start, user_name)
-        if registration.notes is None:
-            registration.notes = message
-        else:
-            registration.notes = registration.notes + "\n" + message
-        registration.save()
+        source = sources[slot_id]
+        destination = destinations[destination_slots[index]]
+        player_name = source.player.full_name
+        source_start = get_start(event, source)
+        destination_start = get_start(event, destination)
+        messages.append("\n{} moved from {} to {} by {}".format(player_name, source_start, destination_start, user_name))
 
-        for fee in source.fees.all():
-            fee.registration_slot = destination
-            fee.save()
+        fee_moves.append(When(registration_slot_id=source.id, then=destination.id))
+
+        destination.registration = registration
+        destination.player = source.player
+        destination.status = "R"
 
-        player_ref = source.player
         source.registration = None
         source.player = None
         source.status = "A"
-        source.save()
 
-        destination.registration = registration
-        destination.player = player_ref
-        destination.status = "R"
-        destination.save()
+    RegistrationFee.objects \
+        .filter(registration_slot_id__in=sources) \
+        .update(registration_slot=Case(*fee_moves, output_field=IntegerField()))
+
+    # free the source slots before filling the destinations to respect the unique (event, player) constraint
+    RegistrationSlot.objects.bulk_update(sources.values(), ["registration", "player", "status"])
+    RegistrationSlot.objects.bulk_update(destinations.values(), ["registration", "player", "status"])
+
+    append_notes(registration, messages)
 
     return Response(status=204)
 
@@ -314,65 +344,82 @@ def move_players(request, registration_id):
 @permission_classes((permissions.IsAuthenticated,))
 def drop_players(request, registration_id):
     source_slots = request.data.get("source_slots", [])
-    registration = Registration.objects.filter(pk=registration_id).get()
+    registration = get_object_or_404(Registration.objects.select_related("event"), pk=registration_id)
+    source_slots, sources = get_slots_in_bulk(
+        registration.slots.select_related("player").only("player__full_name"), source_slots
+    )
+    user_name = request.user.get_full_name()
+    messages = []
 
     for slot_id in source_slots:
-        source = registration.slots.get(pk=slot_id)
+        source = sources[slot_id]
+        player_name = source.player.full_name
+        messages.append("\n{} dropped from the event by {}".format(player_name, user_name))
 
-        user_name = request.user.get_full_name()
-        player_name = "{} {}".format(source.player.first_name, source.player.last_name)
-        message = "\n{} dropped from the event by {}".format(player_name, user_name)
-        if registration.notes is None:
-            registration.notes = message
-        else:
-            registration.notes = registration.notes + "\n" + message
-        registration.save()
-
-        for fee in source.fees.all():
-            fee.registration_slot = None
-            fee.save()
-
-        if registration.event.can_choose:
-            source.registration = None
-            source.player = None
-            source.status = "A"
-            source.save()
-        else:
-            source.delete()
+    RegistrationFee.objects.filter(registration_slot_id__in=sources).update(registration_slot=None)
+
+    if registration.event.can_choose:
+        RegistrationSlot.objects.filter(pk__in=sources).update(registration=None, player=None, status="A")
+    else:
+        RegistrationSlot.objects.filter(pk__in=sources).delete()
+
+    append_notes(registration, messages)
 
     return Response(status=204)
 
 
 @api_view(("POST",))
-@permission_classes((permissions.AllowAny,))
+@permission_classes((permissions.IsAdminUser,))
 def import_handicaps(request):
 
     season = request.data.get("season", 0)
     document_id = request.data.get("document_id", 0)
 
-    document = Document.objects.get(pk=document_id)
-    players = Player.objects.all()
-    player_map = {player.ghin: player for player in players}
+    task = import_handicaps_task.delay(season, document_id)
 
-    with document.file.open("r") as csvfile:
-        reader = csv.reader(csvfile, delimiter=',', quotechar='"')
-        next(reader)  # skip header
+    return Response(data={"task_id": task.id}, status=202)
 
-        for row in reader:
-            player = player_map.get(row[2])
 
-            if player is None:
-                continue
+def get_player_and_friend(user, friend_id):
+    # load the current player and the friend with a single query
+    players = list(Player.objects.filter(Q(email=user.email) | Q(pk=friend_id)).only("id", "email"))
+    player = next((p for p in players if p.email == user.email), None)
+    friend = next((p for p in players if p.id == friend_id), None)
 
-            player_hcp = PlayerHandicap(season=season, player=player, handicap=get_index(row[1]))
-            player_hcp.save()
+    if player is None:
+        raise Player.DoesNotExist()
+    if friend is None:
+        raise Http404("No Player matches the given query.")
 
-    return Response(status=204)
+    return player, friend
 
 
-def get_index(cell):
-    idx = str(cell)
-    if idx.startswith("+"):
-        return Decimal(idx[1:]) * -1
-    else:
-        return Decimal(idx)
+def get_slots_in_bulk(queryset, slot_ids):
+    # ids may arrive as strings; every requested slot must be found, as with a get() per slot
+    try:
+        slot_ids = [int(slot_id) for slot_id in slot_ids]
+    except (TypeError, ValueError):
+        raise ValidationError("Slot ids must be integers")
+    slots = queryset.in_bulk(slot_ids)
+    if len(slots) != len(set(slot_ids)):
+        raise Http404("No RegistrationSlot matches the given query.")
+    return slot_ids, slots
+
+
+def append_notes(registration, messages):
+    # append in the database so the existing notes are never read back or overwritten
+    if not messages:
+        return
+    text = "\n".join(messages)
+    Registration.objects.filter(pk=registration.pk).update(notes=Case(
+        When(notes__isnull=True, then=Value(text)),
+        default=Concat("notes", Value("\n" + text)),
+        output_field=TextField(),
+    ))
+
+
+def get_favorites(player):
+    # PlayerSerializer nests the profile picture and its tags
+    return player.favorites \
+        .select_related("profile_picture") \
+        .prefetch_related("profile_picture__tags__tag")
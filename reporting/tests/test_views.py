@@ -0,0 +1,65 @@
+from decimal import Decimal
+from http import HTTPStatus
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from unittest import mock
+
+from events.models import EventFee
+
+
+class EventReportTests(TestCase):
+    fixtures = ["fee_type", "event", "event_fee", "course", "hole", "user"]
+
+    def setUp(self):
+        cache.clear()
+        EventFee.objects.filter(event=3).update(override_amount=Decimal("2.50"), override_restriction="Seniors")
+        self.fee_ids = list(EventFee.objects.filter(event=3).values_list("id", flat=True))
+
+    def tearDown(self):
+        cache.clear()
+
+    def get_report(self):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.get(email="finleysg@gmail.com"))
+        return client.get("/api/events/3/event-report/")
+
+    @mock.patch("reporting.views.get_registration_fees_by_event")
+    @mock.patch("reporting.views.get_registrations_by_event")
+    def test_event_report_adds_fee_columns(self, mock_registrations, mock_fees):
+        mock_registrations.return_value = [{"player_id": 2}, {"player_id": 1}, {"player_id": 3}]
+        mock_fees.return_value = \
+            [{"event_fee_id": fee_id, "player_id": 1, "amount_paid": Decimal("2.50")} for fee_id in self.fee_ids] + \
+            [{"event_fee_id": fee_id, "player_id": 2, "amount_paid": Decimal("5.00")} for fee_id in self.fee_ids]
+
+        response = self.get_report()
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual([row["player_id"] for row in response.data], [2, 1, 3])
+
+        hogan, finley, palmer = response.data
+        self.assertEqual(hogan["Event Fee"], Decimal("5.00"))
+        self.assertEqual(hogan["is_override"], 0)
+        self.assertEqual(hogan["override_for"], "Seniors")
+        self.assertEqual(finley["Gross Skins"], Decimal("2.50"))
+        self.assertEqual(finley["is_override"], 1)
+        self.assertEqual(finley["override_for"], "Seniors")
+        self.assertIsNone(palmer["Event Fee"])
+        self.assertIsNone(palmer["is_override"])
+        self.assertIsNone(palmer["override_for"])
+
+    @mock.patch("reporting.views.get_registration_fees_by_event")
+    @mock.patch("reporting.views.get_registrations_by_event")
+    def test_event_report_is_cached(self, mock_registrations, mock_fees):
+        mock_registrations.return_value = [{"player_id": 1}]
+        mock_fees.return_value = []
+
+        self.get_report()
+        response = self.get_report()
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.data[0]["player_id"], 1)
+        mock_registrations.assert_called_once_with(3)
+        mock_fees.assert_called_once_with(3)
@@ -1,4 +1,5 @@
 from django.db import connection
+from django.views.decorators.cache import cache_page
 
 from rest_framework import permissions
 from rest_framework.decorators import api_view, permission_classes
@@ -9,10 +10,23 @@ from events.models import EventFee
 from payments.models import Payment
 from payments.serializers import PaymentReportSerializer
 
+# Seconds a rendered report is served from the cache; applied after the permission check
+EVENT_REPORT_TIMEOUT = 60
+MEMBERSHIP_REPORT_TIMEOUT = 60 * 15
+
+# Rows pulled from a cursor per round trip when building report dictionaries
+FETCH_SIZE = 1000
+
 
 def fetch_all_as_dictionary(cursor):
-    columns = [col[0] for col in cursor.description]
-    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    columns = tuple(col[0] for col in cursor.description)
+    results = []
+    while True:
+        # some drivers signal the end with an empty tuple, others with an empty list
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            return results
+        results.extend(dict(zip(columns, row)) for row in rows)
 
 
 def get_registrations_by_event(event_id):
@@ -59,29 +73,29 @@ def refund_details(payment_id):
 
 @api_view(("GET",))
 @permission_classes((permissions.IsAuthenticated,))
+@cache_page(EVENT_REPORT_TIMEOUT)
 def event_report(request, event_id):
 
-    event_fees = EventFee.objects.all().filter(event=event_id).select_related("fee_type")
+    event_fees = EventFee.objects.report_columns(event_id)
+
     registration_fees = get_registration_fees_by_event(event_id)
     registrations = get_registrations_by_event(event_id)
 
+    # index the fees by (event fee, player), keeping the first row for each pair
+    fee_index = {}
+    for rf in registration_fees:
+        fee_index.setdefault((rf["event_fee_id"], rf["player_id"]), rf)
+
     for registration in registrations:
-        for fee in event_fees:
-            player_fee = next(
-                (
-                    rf
-                    for rf in registration_fees
-                    if rf["event_fee_id"] == fee.id
-                    and rf["player_id"] == registration["player_id"]
-                ),
-                None,
-            )
+        player_id = registration["player_id"]
+        for fee_id, fee_name, override_amount, override_restriction in event_fees:
+            player_fee = fee_index.get((fee_id, player_id))
             if player_fee is not None:
-                registration[fee.fee_type.name] = player_fee.get("amount_paid", None)
-                registration["is_override"] = 1 if player_fee.get("amount_paid", None) == fee.override_amount else 0
-                registration["override_for"] = fee.override_restriction
+                registration[fee_name] = player_fee.get("amount_paid", None)
+                registration["is_override"] = 1 if player_fee.get("amount_paid", None) == override_amount else 0
+                registration["override_for"] = override_restriction
             else:
-                registration[fee.fee_type.name] = None
+                registration[fee_name] = None
                 registration["is_override"] = None
                 registration["override_for"] = None
 
@@ -105,6 +119,7 @@ def skins_report(request, event_id):
 
 @api_view(("GET",))
 @permission_classes((permissions.IsAuthenticated,))
+@cache_page(MEMBERSHIP_REPORT_TIMEOUT)
 def membership_report(request, season):
 
     membership = get_membership_data(season)
@@ -8,6 +8,7 @@ from register.admin import CurrentSeasonFilter
 class EventScoreAdmin(admin.ModelAdmin):
     fields = ["event", "player", "hole", "score", "is_net", ]
     list_display = ["event", "player", "hole", "score", "is_net", ]
+    list_select_related = ("event", "player", "hole__course", )
     date_hierarchy = "event__start_date"
     ordering = ["event", "player", ]
     search_fields = ("player__first_name", "player__last_name", )
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('events', '0012_eventfeeoverride_eventfee_override_amount_and_more'),
+        ('register', '0016_player_full_name'),
+        ('scores', '0002_alter_eventscore_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventscore',
+            index=models.Index(fields=['player', 'is_net', 'event'], name='score_player_net_event_idx'),
+        ),
+    ]
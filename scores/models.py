@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models import UniqueConstraint, CASCADE
+from django.db.models import Index, UniqueConstraint, CASCADE
 
 from courses.models import Hole
 from events.models import Event
@@ -19,6 +19,9 @@ class EventScore(models.Model):
         constraints = [
             UniqueConstraint(fields=["event", "player", "hole", "is_net"], name="unique_event_score")
         ]
+        indexes = [
+            Index(fields=["player", "is_net", "event"], name="score_player_net_event_idx"),
+        ]
 
     def __str__(self):
         return "{}: {} {} {} {}".format(self.event, self.player, self.hole, self.score, "net" if self.is_net else "gross")
@@ -0,0 +1,121 @@
+import structlog
+
+from celery import shared_task
+from collections import defaultdict
+from django.db import transaction
+
+from core.util import bulk_upsert
+from courses.models import Course
+from documents.models import Document
+from documents.utils import iter_workbook_rows
+from events.models import Event
+from register.models import Player
+from scores.models import EventScore
+from scores.utils import is_hole_scores, get_score_type, get_course, get_score_rows, get_player_name, get_scores
+
+logger = structlog.getLogger(__name__)
+
+# Rows written per INSERT or UPDATE statement when saving a sheet of scores
+SCORE_BATCH_SIZE = 1000
+
+
+@shared_task
+def import_scores_task(event_id, document_id):
+    event = Event.objects.get(pk=event_id)
+    document = Document.objects.get(pk=document_id)
+    courses = {course.name: course for course in Course.objects.all()}
+    # full_name is the same "first last" text that Player.player_name() builds
+    player_map = Player.objects.member_ids_by_name()
+    failures = []
+
+    # existing scores for the event, by (player, is_net) and then hole number
+    existing_scores = defaultdict(dict)
+    for score in EventScore.objects.filter(event=event).select_related("hole"):
+        existing_scores[(score.player_id, score.is_net)][score.hole.hole_number] = score
+
+    # commit the whole import at once rather than once per player
+    with transaction.atomic():
+        for sheet_name, rows in iter_workbook_rows(document):
+            if is_hole_scores(sheet_name):
+                score_type = get_score_type(sheet_name)
+                course_name = get_course(sheet_name)
+                course = courses.get(course_name)
+                if course is None:
+                    message = f"course {course_name} not found when importing sheet {sheet_name}"
+                    logger.warn(message)
+                    failures.append(message)
+                    continue
+
+                # scores read from this sheet, by (player, is_net, hole number)
+                sheet_scores = {}
+                for row in get_score_rows(rows):
+                    try:
+                        player_name = get_player_name(row[0], score_type)
+                        player_id = player_map.get(player_name)
+                        if player_id is None:
+                            message = f"player {player_name} not found when importing {score_type} scores"
+                            logger.warn(message)
+                            failures.append(message)
+                            continue
+
+                        score_map = get_scores(row)
+                        if score_map is not None:
+                            is_net = score_type == "net"
+                            plan_scores(event, course, player_id, score_map, is_net, sheet_scores)
+                    except Exception as e:
+                        failures.append(str(e))
+                        logger.error(e)
+
+                new_scores, changed_scores = split_scores(sheet_scores, existing_scores)
+
+                # one flush per sheet, in a savepoint so a failed sheet does not abort the import
+                try:
+                    with transaction.atomic():
+                        save_scores(new_scores, changed_scores)
+                except Exception as e:
+                    failures.append(f"{sheet_name}: {e}")
+                    logger.error(e)
+                    continue
+
+                # only rows that were written count as existing for later sheets
+                for score in new_scores + changed_scores:
+                    existing_scores[(score.player_id, score.is_net)][score.hole.hole_number] = score
+
+    # do not keep the data file
+    document.file.delete()
+    document.delete()
+
+    logger.info("Scores imported", event_id=event_id, document_id=document_id, failures=len(failures))
+
+    # the failures are kept with the task result for the client to poll
+    return failures
+
+
+def plan_scores(event, course, player_id, score_map, is_net, sheet_scores):
+    # the course holes were prefetched with the course; a repeated row for a player replaces the earlier one
+    for hole in course.holes.all():
+        sheet_scores[(player_id, is_net, hole.hole_number)] = EventScore(
+            event=event, player_id=player_id, hole=hole, score=score_map[hole.hole_number], is_net=is_net
+        )
+
+
+def split_scores(sheet_scores, existing_scores):
+    new_scores = []
+    changed_scores = []
+    for (player_id, is_net, hole_number), score in sheet_scores.items():
+        saved = existing_scores[(player_id, is_net)].get(hole_number)
+        if saved is None or saved.pk is None:
+            # MySQL does not return ids from bulk_create, so a row written by an earlier sheet
+            # has no pk and goes through the upsert
+            new_scores.append(score)
+        elif saved.score != score.score:
+            # only rows whose score changed are sent back to the database
+            score.pk = saved.pk
+            changed_scores.append(score)
+    return new_scores, changed_scores
+
+
+def save_scores(new_scores, changed_scores):
+    bulk_upsert(EventScore.objects, new_scores, unique_fields=["event", "player", "hole", "is_net"],
+                update_fields=["score"], batch_size=SCORE_BATCH_SIZE)
+    EventScore.objects.bulk_update(changed_scores, ["score"], batch_size=SCORE_BATCH_SIZE)
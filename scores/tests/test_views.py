@@ -0,0 +1,159 @@
+from http import HTTPStatus
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+from unittest import mock
+
+from courses.models import Hole
+from register.models import Player
+from scores.models import EventScore
+from scores.tasks import import_scores_task, save_scores
+
+
+class EventScoreViewTests(TestCase):
+    fixtures = ["fee_type", "event", "event_fee", "course", "hole", "user", "player"]
+
+    def setUp(self):
+        holes = Hole.objects.filter(course=1).order_by("hole_number")
+        EventScore.objects.bulk_create(
+            [EventScore(event_id=1, player_id=1, hole=hole, score=4) for hole in holes]
+        )
+
+    def test_score_list_query_count(self):
+        client = APIClient()
+        # the holes are joined to the scores, so the list is a single query
+        with self.assertNumQueries(1):
+            response = client.get("/api/scores/?season=0&player_id=1")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.data), 9)
+        self.assertEqual(response.data[0]["hole"]["hole_number"], 1)
+
+    def test_flat_score_list(self):
+        client = APIClient()
+        with self.assertNumQueries(1):
+            response = client.get("/api/scores/?season=0&player_id=1&flat=1")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.data), 9)
+        self.assertEqual(set(response.data[0]), {
+            "id", "event_id", "player_id", "hole__hole_number", "score", "is_net", "event__start_date"
+        })
+        self.assertEqual(response.data[0]["hole__hole_number"], 1)
+        self.assertEqual(response.data[0]["score"], 4)
+
+    def test_score_list_requires_filters(self):
+        client = APIClient()
+        with self.assertNumQueries(0):
+            response = client.get("/api/scores/?season=0")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.data, [])
+
+
+class ImportScoresTests(TestCase):
+    fixtures = ["fee_type", "event", "event_fee", "course", "hole", "user", "player"]
+
+    @mock.patch("scores.views.import_scores_task")
+    def test_import_scores_is_queued(self, mock_task):
+        mock_task.delay.return_value.id = "abc"
+        client = APIClient()
+        client.force_authenticate(user=User.objects.get(email="finleysg@gmail.com"))
+
+        response = client.post("/api/import-scores/", data={"event_id": 1, "document_id": 7}, format="json")
+
+        self.assertEqual(response.status_code, HTTPStatus.ACCEPTED)
+        self.assertEqual(response.data, {"task_id": "abc"})
+        mock_task.delay.assert_called_once_with(1, 7)
+
+    def test_import_scores_requires_admin(self):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.get(email="hogan@golf.com"))
+
+        response = client.post("/api/import-scores/", data={"event_id": 1, "document_id": 7}, format="json")
+
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+    @mock.patch("scores.views.AsyncResult")
+    def test_import_scores_status(self, mock_result):
+        mock_result.return_value.status = "SUCCESS"
+        mock_result.return_value.successful.return_value = True
+        mock_result.return_value.result = ["player Nobody Here not found when importing gross scores"]
+        client = APIClient()
+        client.force_authenticate(user=User.objects.get(email="finleysg@gmail.com"))
+
+        response = client.get("/api/import-scores/abc/")
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.data["status"], "SUCCESS")
+        self.assertEqual(response.data["failures"], mock_result.return_value.result)
+        mock_result.assert_called_once_with("abc")
+
+    def test_import_scores_status_requires_admin(self):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.get(email="hogan@golf.com"))
+
+        response = client.get("/api/import-scores/abc/")
+
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+    @mock.patch("scores.tasks.iter_workbook_rows")
+    @mock.patch("scores.tasks.Document")
+    def test_import_scores_task(self, mock_document, mock_rows):
+        player = Player.objects.get(pk=1)
+        player.is_member = True
+        with self.captureOnCommitCallbacks(execute=True):
+            player.save()
+        mock_rows.return_value = [
+            ("East Gross Hole Scores", iter([
+                ("Gross Score",),
+                ("Stuart Finley", 4, 5, 3, 4, 4, 5, 3, 4, 4),
+                ("Nobody Here", 4, 4, 4, 4, 4, 4, 4, 4, 4),
+            ])),
+            ("East Skins", iter([("Stuart Finley", 1)])),
+        ]
+
+        failures = import_scores_task(1, 7)
+
+        self.assertEqual(failures, ["player Nobody Here not found when importing gross scores"])
+        scores = EventScore.objects.filter(event=1, player=1, is_net=False).order_by("hole__hole_number")
+        self.assertEqual([score.score for score in scores], [4, 5, 3, 4, 4, 5, 3, 4, 4])
+        mock_document.objects.get.return_value.delete.assert_called_once()
+
+    @mock.patch("scores.tasks.iter_workbook_rows")
+    @mock.patch("scores.tasks.Document")
+    def test_import_scores_task_after_failed_sheet(self, mock_document, mock_rows):
+        player = Player.objects.get(pk=1)
+        player.is_member = True
+        with self.captureOnCommitCallbacks(execute=True):
+            player.save()
+        mock_rows.return_value = [
+            ("East Gross Hole Scores", iter([("Stuart Finley", 4, 4, 4, 4, 4, 4, 4, 4, 4)])),
+            ("East Gross Hole Scores (2)", iter([("Stuart Finley", 5, 5, 5, 5, 5, 5, 5, 5, 5)])),
+        ]
+
+        flushes = []
+
+        def fail_first_flush(new_scores, changed_scores):
+            flushes.append(len(new_scores))
+            if len(flushes) == 1:
+                raise Exception("flush failed")
+            save_scores(new_scores, changed_scores)
+
+        with mock.patch("scores.tasks.save_scores", side_effect=fail_first_flush):
+            failures = import_scores_task(1, 7)
+
+        # the rolled back sheet is reported and does not hide the next sheet's scores
+        self.assertEqual(failures, ["East Gross Hole Scores: flush failed"])
+        scores = EventScore.objects.filter(event=1, player=1, is_net=False)
+        self.assertEqual([score.score for score in scores], [5] * 9)
+
+    def test_save_scores_updates_conflicting_rows(self):
+        holes = Hole.objects.filter(course=1).order_by("hole_number")
+        EventScore.objects.bulk_create(
+            [EventScore(event_id=1, player_id=1, hole=hole, score=4) for hole in holes]
+        )
+
+        save_scores([EventScore(event_id=1, player_id=1, hole=holes[0], score=6)], [])
+
+        scores = EventScore.objects.filter(event=1, player=1, is_net=False).order_by("hole__hole_number")
+        self.assertEqual(len(scores), 9)
+        self.assertEqual(scores[0].score, 6)
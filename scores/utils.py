@@ -1,3 +1,9 @@
+import re
+
+# First-column text of the heading, summary and flight rows on a score sheet
+NOT_A_SCORE_ROW = re.compile(r"gross score|net score|to par|strokes|flight|bl\[", re.IGNORECASE)
+
+
 class PlayerScore:
     def __init__(self, event, player, course, score_type):
         self.event = event.id
@@ -21,8 +27,8 @@ class PlayerScore:
         return f"{self.player} ({self.course} {self.score_type}): {self.total_score()}"
 
 
-def is_hole_scores(sheet):
-    if "hole" in sheet.name.lower() and "skin" not in sheet.name.lower() and "points" not in sheet.name.lower():
+def is_hole_scores(sheet_name):
+    if "hole" in sheet_name.lower() and "skin" not in sheet_name.lower() and "points" not in sheet_name.lower():
         return True
     return False
 
@@ -45,17 +51,12 @@ def get_course(sheet_name):
     return "invalid"
 
 
-def get_score_rows(sheet):
-    for row_index in range(sheet.nrows):
-        value = sheet.cell(row_index, 0).value
-        if value != "" and \
-                "gross score" not in value.lower() and \
-                "net score" not in value.lower() and \
-                "to par" not in value.lower() and \
-                "strokes" not in value.lower() and \
-                "flight" not in value.lower() and \
-                "bl[" not in value.lower():
-            yield row_index
+def get_score_rows(rows):
+    # blank cells are "" from xlrd and None from openpyxl
+    for row in rows:
+        value = row[0] if row else None
+        if isinstance(value, str) and value != "" and not NOT_A_SCORE_ROW.search(value):
+            yield row
 
 
 def get_player_name(name, gross_or_net):
@@ -65,18 +66,12 @@ def get_player_name(name, gross_or_net):
     return name
 
 
-def get_scores(sheet, row_index):
+def get_scores(row):
+    # hole scores are in columns 1 through 9
+    values = row[1:10]
+    if len(values) != 9:
+        return None
     try:
-        return {
-            1: int(sheet.cell(row_index, 1).value),
-            2: int(sheet.cell(row_index, 2).value),
-            3: int(sheet.cell(row_index, 3).value),
-            4: int(sheet.cell(row_index, 4).value),
-            5: int(sheet.cell(row_index, 5).value),
-            6: int(sheet.cell(row_index, 6).value),
-            7: int(sheet.cell(row_index, 7).value),
-            8: int(sheet.cell(row_index, 8).value),
-            9: int(sheet.cell(row_index, 9).value),
-        }
+        return {hole: int(value) for hole, value in enumerate(values, start=1)}
     except:
         return None